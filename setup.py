@@ -9,7 +9,11 @@ setup(
         "pandas>=2.0.0",
         "numpy>=1.24.0",
         "scipy>=1.10.0",
+        "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "jit": ["numba>=0.57.0"],
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="Multi-DEX arbitrage detection and execution system",
@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 class BaseAMM(ABC):
     """Abstract base class for all AMM implementations"""
 
+    __slots__ = ('name', 'fee')
+
     def __init__(self, name, fee=0.003):
         self.name = name
         self.fee = fee
@@ -1,8 +1,72 @@
 """Curve Finance StableSwap Implementation"""
 
 from .base_amm import BaseAMM
+from ..utils.jit import njit
 import numpy as np
 
+# Newton iterations stop once a step is below this fraction of the
+# estimate (floored at an absolute step of 1e-12). Wei-scale reserves still
+# resolve to well under one unit: float64 cannot represent a step of 1 at
+# that magnitude anyway, so the old absolute check only fired on exact
+# repeats.
+_REL_TOL = 1e-12
+
+
+@njit(cache=True, fastmath=True)
+def _curve_D(reserves, n, Ann):
+    """Solve the StableSwap invariant D with Newton's method"""
+    # Reserves are fixed across iterations, so sum and product are hoisted
+    S = 0.0
+    prod_x = 1.0
+    for k in range(n):
+        S += reserves[k]
+        prod_x *= reserves[k]
+    nn_prod_x = (n ** n) * prod_x
+    D = S
+
+    for _ in range(255):
+        # D_P = D^(n+1) / (n^n * prod(x_i)), one pow instead of n divisions
+        D_P = D ** (n + 1) / nn_prod_x
+
+        D_prev = D
+        D = (Ann * S + D_P * n) * D / ((Ann - 1) * D + (n + 1) * D_P)
+
+        if abs(D - D_prev) <= max(1.0, abs(D)) * _REL_TOL:
+            break
+
+    return D
+
+
+@njit(cache=True, fastmath=True)
+def _curve_y(reserves, i, j, x, D, Ann, n):
+    """Solve the StableSwap invariant for the balance of token j"""
+    S_ = 0.0
+    prod_x = 1.0
+
+    for k in range(n):
+        if k == i:
+            _x = x
+        elif k == j:
+            continue
+        else:
+            _x = reserves[k]
+        S_ += _x
+        prod_x *= _x
+
+    # c = D^(n+1) / (n^n * prod(x_k, k != j) * Ann)
+    c = D ** (n + 1) / ((n ** n) * prod_x * Ann)
+    b = S_ + D / Ann
+    y = D
+
+    for _ in range(255):
+        y_prev = y
+        y = (y * y + c) / (2 * y + b - D)
+        if abs(y - y_prev) <= max(1.0, abs(y)) * _REL_TOL:
+            break
+
+    return y
+
+
 class CurveAMM(BaseAMM):
     """
     Curve StableSwap formula for low-slippage stablecoin swaps.
@@ -10,85 +74,72 @@ class CurveAMM(BaseAMM):
     Formula: A * n^n * sum(x_i) + D = A * D * n^n + D^(n+1) / (n^n * prod(x_i))
     """
 
+    __slots__ = ('_reserves', 'A', 'n', '_Ann', '_D_cache')
+
     def __init__(self, reserves, amplification_coef=100, fee=0.0004, name="Curve"):
         super().__init__(name, fee)
-        self.reserves = list(reserves)
         self.A = amplification_coef
-        self.n = len(reserves)
+        self.reserves = reserves
 
-    def get_D(self):
-        """Calculate invariant D using Newton's method"""
-        n = self.n
-        S = sum(self.reserves)
-        D = S
-        Ann = self.A * (n ** n)
+    @property
+    def reserves(self):
+        """
+        Current pool balances as a tuple.
 
-        for _ in range(255):
-            D_P = D
-            for reserve in self.reserves:
-                D_P = D_P * D / (n * reserve)
+        The float64 array behind it is the only copy of pool state, so the
+        tuple is read-only; assign a new sequence to replace the balances.
+        """
+        return tuple(self._reserves.tolist())
 
-            D_prev = D
-            D = (Ann * S + D_P * n) * D / ((Ann - 1) * D + (n + 1) * D_P)
+    @reserves.setter
+    def reserves(self, reserves):
+        self._reserves = np.array(reserves, dtype=np.float64)
+        # The coin count may change with the new balances
+        self.n = len(self._reserves)
+        self._Ann = self.A * (self.n ** self.n)
+        self._D_cache = None
 
-            if abs(D - D_prev) < 1:
-                break
+    def get_D(self):
+        """
+        Calculate invariant D using Newton's method.
 
-        return D
+        D depends only on the reserves and A, so it is cached until a swap
+        or assignment changes the reserves.
+        """
+        if self._D_cache is None:
+            self._D_cache = _curve_D(self._reserves, self.n, self._Ann)
+        return self._D_cache
 
-    def get_y(self, i, j, x):
+    def get_y(self, i, j, x, D=None):
         """
         Calculate output amount for token j given input x for token i.
         Solves the StableSwap invariant equation for y.
         """
-        n = self.n
-        D = self.get_D()
-        Ann = self.A * (n ** n)
-        c = D
-        S_ = 0
-
-        for k in range(n):
-            if k == i:
-                _x = x
-            elif k == j:
-                continue
-            else:
-                _x = self.reserves[k]
-            S_ += _x
-            c = c * D / (n * _x)
-
-        c = c * D / (n * Ann)
-        b = S_ + D / Ann
-        y = D
-
-        for _ in range(255):
-            y_prev = y
-            y = (y * y + c) / (2 * y + b - D)
-            if abs(y - y_prev) < 1:
-                break
-
-        return y
+        if D is None:
+            D = self.get_D()
+        return _curve_y(self._reserves, i, j, float(x), D, self._Ann, self.n)
 
     def get_amount_out(self, amount_in, i=0, j=1):
         """Calculate output amount with fee"""
-        x = self.reserves[i] + amount_in
-        y = self.get_y(i, j, x)
-        dy = self.reserves[j] - y
+        x = self._reserves[i] + amount_in
+        y = self.get_y(i, j, x, self.get_D())
+        dy = self._reserves[j] - y
         return dy * (1 - self.fee)
 
     def get_spot_price(self):
         """Calculate spot price (reserve1 / reserve0)"""
-        return self.reserves[1] / self.reserves[0]
+        return self._reserves[1] / self._reserves[0]
 
     def swap(self, amount_in, direction):
         """Execute swap and update reserves"""
         if direction == 'x_to_y':
             amount_out = self.get_amount_out(amount_in, 0, 1)
-            self.reserves[0] += amount_in
-            self.reserves[1] -= amount_out
+            self._reserves[0] += amount_in
+            self._reserves[1] -= amount_out
         else:
             amount_out = self.get_amount_out(amount_in, 1, 0)
-            self.reserves[1] += amount_in
-            self.reserves[0] -= amount_out
+            self._reserves[1] += amount_in
+            self._reserves[0] -= amount_out
 
+        self._D_cache = None
         return amount_out
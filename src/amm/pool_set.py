@@ -0,0 +1,79 @@
+"""Struct-of-Arrays Pool State"""
+
+import numpy as np
+
+from .curve import CurveAMM
+
+# Pool kind codes stored in PoolSet.kind
+KIND_UNISWAP_V2 = 0
+KIND_CURVE = 1
+
+
+def _pair_reserves(amm):
+    """Return (reserve0, reserve1) for a two-token view of an AMM"""
+    if isinstance(amm, CurveAMM):
+        return amm.reserves[0], amm.reserves[1]
+    return amm.reserve0, amm.reserve1
+
+
+class PoolSet:
+    """
+    Parallel NumPy arrays holding the state of many pools.
+
+    Row i describes one pool: reserves r0[i] / r1[i], fee[i] and a kind
+    code (KIND_UNISWAP_V2 or KIND_CURVE). Curve pools are tracked by their
+    first two coins, which is what spot price scans need.
+    """
+
+    def __init__(self, r0, r1, fee, kind=None, names=None):
+        self.r0 = np.array(r0, dtype=np.float64)
+        self.r1 = np.array(r1, dtype=np.float64)
+        self.fee = np.array(fee, dtype=np.float64)
+
+        if kind is None:
+            self.kind = np.full(len(self.r0), KIND_UNISWAP_V2, dtype=np.int8)
+        else:
+            self.kind = np.array(kind, dtype=np.int8)
+
+        if names is None:
+            names = ["Pool %d" % i for i in range(len(self.r0))]
+        self.names = list(names)
+
+    @classmethod
+    def from_amms(cls, amms):
+        """Build a PoolSet from a list of AMM objects"""
+        reserves = [_pair_reserves(amm) for amm in amms]
+        return cls(
+            r0=[r[0] for r in reserves],
+            r1=[r[1] for r in reserves],
+            fee=[amm.fee for amm in amms],
+            kind=[
+                KIND_CURVE if isinstance(amm, CurveAMM) else KIND_UNISWAP_V2
+                for amm in amms
+            ],
+            names=[amm.name for amm in amms]
+        )
+
+    def __len__(self):
+        return len(self.r0)
+
+    def spot_prices(self):
+        """Spot price (reserve1 / reserve0) of every pool"""
+        return self.r1 / self.r0
+
+    def update(self, idx, new_r0, new_r1):
+        """
+        Overwrite reserves in place.
+
+        Args:
+            idx: Row index, or an index array for a bulk update
+            new_r0: New reserve0 value(s)
+            new_r1: New reserve1 value(s)
+        """
+        self.r0[idx] = new_r0
+        self.r1[idx] = new_r1
+
+    def refresh(self, amms):
+        """Re-read reserves from the AMM objects this set was built from"""
+        for i, amm in enumerate(amms):
+            self.r0[i], self.r1[i] = _pair_reserves(amm)
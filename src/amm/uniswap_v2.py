@@ -7,11 +7,19 @@ class UniswapV2AMM(BaseAMM):
     Uniswap V2 AMM using constant product formula: x * y = k
     """
 
+    __slots__ = ('reserve0', 'reserve1', 'k', '_one_minus_fee')
+
     def __init__(self, token0_reserve, token1_reserve, fee=0.003, name="Uniswap V2"):
         super().__init__(name, fee)
         self.reserve0 = token0_reserve
         self.reserve1 = token1_reserve
         self.k = token0_reserve * token1_reserve
+        self._one_minus_fee = 1.0 - fee
+
+    @classmethod
+    def from_poolset(cls, ps, i):
+        """Build a standalone AMM from row i of a PoolSet"""
+        return cls(float(ps.r0[i]), float(ps.r1[i]), float(ps.fee[i]), ps.names[i])
 
     def get_amount_out(self, amount_in, reserve_in, reserve_out):
         """
@@ -24,7 +32,7 @@ class UniswapV2AMM(BaseAMM):
         if amount_in <= 0:
             return 0
 
-        amount_in_with_fee = amount_in * (1 - self.fee)
+        amount_in_with_fee = amount_in * self._one_minus_fee
         numerator = amount_in_with_fee * reserve_out
         denominator = reserve_in + amount_in_with_fee
 
@@ -1,72 +1,230 @@
 """Arbitrage Opportunity Detection Engine"""
 
+import time
 import numpy as np
 from typing import List, Dict
 from scipy.optimize import minimize_scalar
 
+from ..amm.uniswap_v2 import UniswapV2AMM
+from ..amm.curve import CurveAMM
+from ..amm.pool_set import PoolSet, KIND_UNISWAP_V2
+from .opportunity import Opportunity
+
+# Search interval for the input trade size
+_TRADE_SIZE_BOUNDS = (0.01, 1000)
+
+# Starting amounts tried for each triangular path
+_TRIANGULAR_START_AMOUNTS = (0.1, 1, 10, 100)
+
+# Placeholder gas cost per opportunity when no GasEstimator is supplied
+_DEFAULT_GAS_COST_ETH = 0.001  # 0.001 ETH
+
+
+def _arb_profit_v2(amount, r0a, r1a, fee_a, r0b, r1b, fee_b):
+    """
+    Profit of swapping token0 -> token1 in pool A and token1 -> token0 in
+    pool B, using the Uniswap V2 closed form for both legs.
+    """
+    amount_in_a = (1 - fee_a) * amount
+    amount_out_buy = amount_in_a * r1a / (r0a + amount_in_a)
+
+    amount_in_b = (1 - fee_b) * amount_out_buy
+    amount_out_sell = amount_in_b * r0b / (r1b + amount_in_b)
+
+    return amount_out_sell - amount
+
+
+def _optimal_v2_v2_amount(r0a, r1a, fa, r0b, r1b, fb):
+    """
+    Profit-maximizing input for the V2 -> V2 round trip in closed form.
+
+    Two constant-product legs compose into a single constant-product curve,
+    so setting d(profit)/dx = 0 gives:
+
+        x* = (sqrt(ga * gb * r0a * r1a * r0b * r1b) - r0a * r1b)
+             / (ga * (r1b + gb * r1a))
+
+    with ga = 1 - fa and gb = 1 - fb. A non-positive x* means no round trip
+    is profitable.
+    """
+    ga = 1 - fa
+    gb = 1 - fb
+    numerator = np.sqrt(ga * gb * r0a * r1a * r0b * r1b) - r0a * r1b
+    return numerator / (ga * (r1b + gb * r1a))
+
+
+def _v2_amount_out(amount_in, reserve_in, reserve_out, gamma):
+    """Vectorized UniswapV2AMM.get_amount_out, with gamma = 1 - fee"""
+    amount_in_with_fee = gamma * amount_in
+    return amount_in_with_fee * reserve_out / (reserve_in + amount_in_with_fee)
+
+
+def _quote(pool, amount_in, zero_for_one):
+    """
+    Output of swapping through one pool without mutating it.
+
+    Args:
+        zero_for_one: True for token0 -> token1, False for token1 -> token0
+    """
+    if isinstance(pool, CurveAMM):
+        if zero_for_one:
+            return pool.get_amount_out(amount_in, 0, 1)
+        return pool.get_amount_out(amount_in, 1, 0)
+
+    if zero_for_one:
+        return pool.get_amount_out(amount_in, pool.reserve0, pool.reserve1)
+    return pool.get_amount_out(amount_in, pool.reserve1, pool.reserve0)
+
+
+def _round_trip_profit(buy_pool, sell_pool, amount):
+    """Gross profit of token0 -> token1 in buy_pool, then back in sell_pool"""
+    amount_out_buy = _quote(buy_pool, amount, True)
+    amount_out_sell = _quote(sell_pool, amount_out_buy, False)
+    return amount_out_sell - amount
+
+
+def _optimize_v2_v2(r0a, r1a, fa, r0b, r1b, fb):
+    """
+    Bounded optimal trade size and gross profit for V2 -> V2 round trips.
+
+    Works element-wise over arrays of pool pairs. Profit is concave, so
+    clipping the analytical optimum gives the bounded one; unprofitable
+    pairs get amount 0.
+
+    Returns:
+        (amount, gross_profit)
+    """
+    lo, hi = _TRADE_SIZE_BOUNDS
+    amount = np.clip(_optimal_v2_v2_amount(r0a, r1a, fa, r0b, r1b, fb), lo, hi)
+    profit = _arb_profit_v2(amount, r0a, r1a, fa, r0b, r1b, fb)
+    return np.where(profit > 0, amount, 0.0), profit
+
+
 class ArbitrageDetector:
     """Detects arbitrage opportunities across multiple AMMs"""
 
-    def __init__(self, amms, min_profit_threshold=0.01):
-        self.amms = amms
+    def __init__(self, amms, min_profit_threshold=0.01, gas_estimator=None,
+                 gas_refresh_interval=100):
+        """
+        Args:
+            amms: List of AMM objects, or a PoolSet holding pool state
+                directly (updated in place via PoolSet.update). In PoolSet
+                mode only Uniswap V2 rows are scanned; other kinds need
+                their AMM objects and are skipped
+            min_profit_threshold: Minimum net profit to report
+            gas_estimator: Optional GasEstimator; a fixed placeholder cost is
+                used when omitted
+            gas_refresh_interval: Number of scans between gas re-estimates
+        """
+        if isinstance(amms, PoolSet):
+            # Pool state lives in the arrays; AMM objects are built on demand
+            self.amms = None
+            self.pools = amms
+        else:
+            self.amms = amms
+            self.pools = PoolSet.from_amms(amms)
+
         self.min_profit_threshold = min_profit_threshold
         self.opportunities = []
+        self._refresh_prices()
+
+        self.gas_estimator = gas_estimator
+        self.gas_refresh_interval = gas_refresh_interval
+        self._gas_cost_eth = _DEFAULT_GAS_COST_ETH
+        self._refresh_gas_cost()
+
+    def _refresh_prices(self):
+        """Sync pool arrays with the AMM objects (if any) and compute spot prices"""
+        if self.amms is not None:
+            self.pools.refresh(self.amms)
+        self._prices = self.pools.spot_prices()
+
+    def _refresh_gas_cost(self):
+        """Re-estimate the per-opportunity gas cost from the gas estimator"""
+        if self.gas_estimator is not None:
+            self._gas_cost_eth = self.gas_estimator.estimate_arbitrage_cost()['cost_eth']
+        self._scans_since_gas_refresh = 0
 
     def find_two_pool_arbitrage(self, token_pair):
         """
         Find arbitrage between two pools for the same token pair.
 
         Strategy:
-        1. Compare prices across all pools
+        1. Compare prices across all pools (vectorized over pool arrays)
         2. Calculate potential profit for various trade sizes
         3. Account for gas costs and slippage
         4. Filter opportunities above minimum threshold
         """
         token0, token1 = token_pair
-        pools = [amm for amm in self.amms if amm.has_pair(token0, token1)]
+        now = int(time.time())
+        self._refresh_prices()
+
+        self._scans_since_gas_refresh += 1
+        if self._scans_since_gas_refresh >= self.gas_refresh_interval:
+            self._refresh_gas_cost()
+
+        if self.amms is None:
+            # Only V2 rows can be priced without AMM objects
+            pool_idx = np.flatnonzero(self.pools.kind == KIND_UNISWAP_V2)
+        else:
+            pool_idx = np.flatnonzero(
+                [amm.has_pair(token0, token1) for amm in self.amms]
+            )
+        prices = self._prices[pool_idx]
 
-        opportunities = []
+        # Pairwise relative price differences, upper triangle only
+        diffs = np.abs(prices[:, None] - prices[None, :]) / np.minimum(
+            prices[:, None], prices[None, :]
+        )
+        rows, cols = np.nonzero(np.triu(diffs, k=1) >= 0.001)
+        i, j = pool_idx[rows], pool_idx[cols]
+
+        # Determine trade direction
+        a_cheaper = self._prices[i] < self._prices[j]
+        buy = np.where(a_cheaper, i, j)
+        sell = np.where(a_cheaper, j, i)
+
+        # Find optimal trade size and gross profit, V2 pairs in one pass
+        amounts = np.zeros(len(buy))
+        gross_profit = np.zeros(len(buy))
+        pools = self.pools
+        is_v2 = (pools.kind[buy] == KIND_UNISWAP_V2) & (pools.kind[sell] == KIND_UNISWAP_V2)
+
+        b, s = buy[is_v2], sell[is_v2]
+        amounts[is_v2], gross_profit[is_v2] = _optimize_v2_v2(
+            pools.r0[b], pools.r1[b], pools.fee[b],
+            pools.r0[s], pools.r1[s], pools.fee[s]
+        )
 
-        for i in range(len(pools)):
-            for j in range(i + 1, len(pools)):
-                pool_a = pools[i]
-                pool_b = pools[j]
-
-                # Calculate price difference
-                price_a = pool_a.get_spot_price()
-                price_b = pool_b.get_spot_price()
-
-                if abs(price_a - price_b) / min(price_a, price_b) < 0.001:
-                    continue  # Price difference too small
-
-                # Determine trade direction
-                if price_a < price_b:
-                    buy_pool = pool_a
-                    sell_pool = pool_b
-                else:
-                    buy_pool = pool_b
-                    sell_pool = pool_a
-
-                # Find optimal trade size
-                optimal_amount = self._optimize_trade_size(
-                    buy_pool, sell_pool, token0, token1
+        # Non-V2 pairs only occur with AMM objects; PoolSet mode skips them
+        for k in np.flatnonzero(~is_v2):
+            buy_pool = self.amms[buy[k]]
+            sell_pool = self.amms[sell[k]]
+            amounts[k] = self._optimize_trade_size(
+                buy_pool, sell_pool, token0, token1
+            )
+            if amounts[k] > 0:
+                gross_profit[k] = _round_trip_profit(
+                    buy_pool, sell_pool, amounts[k]
                 )
 
-                if optimal_amount > 0:
-                    profit = self._calculate_net_profit(
-                        buy_pool, sell_pool, token0, token1, optimal_amount
-                    )
-
-                    if profit > self.min_profit_threshold:
-                        opportunities.append({
-                            'buy_pool': buy_pool.name,
-                            'sell_pool': sell_pool.name,
-                            'token_in': token0,
-                            'token_out': token1,
-                            'amount': optimal_amount,
-                            'expected_profit': profit,
-                            'timestamp': self._get_timestamp()
-                        })
+        net_profit = self._calculate_net_profit(gross_profit)
+        found = np.flatnonzero(
+            (amounts > 0) & (net_profit > self.min_profit_threshold)
+        )
+
+        opportunities = []
+
+        for k in found:
+            opportunities.append(Opportunity(
+                buy_pool=pools.names[buy[k]],
+                sell_pool=pools.names[sell[k]],
+                token_in=token0,
+                token_out=token1,
+                amount=amounts[k],
+                expected_profit=net_profit[k],
+                timestamp=now
+            ))
 
         return opportunities
 
@@ -74,95 +232,87 @@ class ArbitrageDetector:
         """
         Find optimal trade size that maximizes profit.
 
-        Uses scipy.optimize.minimize_scalar
+        Uniswap V2 pairs use the analytical optimum; other pools fall back
+        to scipy.optimize.minimize_scalar.
         """
-        def negative_profit(amount):
-            # Simulate buy from pool A
-            buy_pool_copy = buy_pool.copy()
-            amount_out_buy = buy_pool_copy.get_amount_out(
-                amount, buy_pool_copy.reserve0, buy_pool_copy.reserve1
-            )
+        lo, hi = _TRADE_SIZE_BOUNDS
 
-            # Simulate sell to pool B
-            sell_pool_copy = sell_pool.copy()
-            amount_out_sell = sell_pool_copy.get_amount_out(
-                amount_out_buy, sell_pool_copy.reserve1, sell_pool_copy.reserve0
+        if isinstance(buy_pool, UniswapV2AMM) and isinstance(sell_pool, UniswapV2AMM):
+            amount, _ = _optimize_v2_v2(
+                buy_pool.reserve0, buy_pool.reserve1, buy_pool.fee,
+                sell_pool.reserve0, sell_pool.reserve1, sell_pool.fee
             )
+            return float(amount)
 
-            # Net profit (negative for minimization)
-            profit = amount_out_sell - amount
-            return -profit
+        def negative_profit(amount):
+            # Negative for minimization
+            return -_round_trip_profit(buy_pool, sell_pool, amount)
 
         result = minimize_scalar(
             negative_profit,
-            bounds=(0.01, 1000),
+            bounds=(lo, hi),
             method='bounded'
         )
 
         return result.x if -result.fun > 0 else 0
 
-    def _calculate_net_profit(self, buy_pool, sell_pool, token0, token1, amount):
-        """Calculate net profit after gas costs"""
-        # Simulate trades
-        buy_pool_copy = buy_pool.copy()
-        sell_pool_copy = sell_pool.copy()
+    def _calculate_net_profit(self, gross_profit):
+        """Calculate net profit after gas costs (element-wise over arrays)"""
+        return gross_profit - self._gas_cost_eth
 
-        amount_out_buy = buy_pool_copy.swap(amount, 'x_to_y')
-        amount_out_sell = sell_pool_copy.swap(amount_out_buy, 'y_to_x')
+    def find_triangular_arbitrage(self, tokens, legs):
+        """
+        Find triangular arbitrage opportunities across separate pools.
 
-        # Gross profit
-        gross_profit = amount_out_sell - amount
+        Example: ETH -> USDC -> DAI -> ETH
 
-        # Estimate gas costs (placeholder - implement real gas estimation)
-        gas_cost = 0.001  # 0.001 ETH
+        Args:
+            tokens: (token_a, token_b, token_c)
+            legs: Sequence of (ab, bc, ca) pool row indices. Each pool must
+                be a Uniswap V2 pool oriented so the hop swaps its token0
+                for token1 (e.g. pool ab holds token_a as token0). The three
+                pools of a leg are assumed distinct, since each hop is
+                quoted against unmodified reserves.
 
-        return gross_profit - gas_cost
+        All (leg, starting amount) combinations are evaluated at once with
+        the Uniswap V2 closed form, without copying or mutating pools.
+        """
+        token_a, token_b, token_c = tokens
+        pools = self.pools
+        self._refresh_prices()
 
-    def _get_timestamp(self):
-        """Get current timestamp"""
-        import time
-        return int(time.time())
+        legs = np.asarray(legs, dtype=np.intp).reshape(-1, 3)
+        if np.any(pools.kind[legs] != KIND_UNISWAP_V2):
+            raise ValueError("Triangular legs must be Uniswap V2 pools")
 
-    def find_triangular_arbitrage(self, tokens):
-        """
-        Find triangular arbitrage opportunities.
+        # Legs along axis 0, starting amounts along axis 1
+        start_amounts = np.array(_TRIANGULAR_START_AMOUNTS, dtype=np.float64)[None, :]
+        gamma = 1 - pools.fee[legs]
+        r0 = pools.r0[legs]
+        r1 = pools.r1[legs]
+
+        # Step 1: A -> B
+        amount_b = _v2_amount_out(start_amounts, r0[:, :1], r1[:, :1], gamma[:, :1])
+
+        # Step 2: B -> C
+        amount_c = _v2_amount_out(amount_b, r0[:, 1:2], r1[:, 1:2], gamma[:, 1:2])
+
+        # Step 3: C -> A
+        final_amount_a = _v2_amount_out(amount_c, r0[:, 2:], r1[:, 2:], gamma[:, 2:])
+
+        profit = final_amount_a - start_amounts
+        profit_percentage = (profit / start_amounts) * 100
 
-        Example: ETH -> USDC -> DAI -> ETH
-        """
-        token_a, token_b, token_c = tokens
         paths = []
 
-        for amm in self.amms:
-            if not (amm.has_pair(token_a, token_b) and 
-                    amm.has_pair(token_b, token_c) and 
-                    amm.has_pair(token_c, token_a)):
-                continue
-
-            # Test various starting amounts
-            for start_amount in [0.1, 1, 10, 100]:
-                # Create copy of AMM
-                amm_copy = amm.copy()
-
-                # Step 1: A -> B
-                amount_b = amm_copy.swap(start_amount, 'a_to_b')
-
-                # Step 2: B -> C
-                amount_c = amm_copy.swap(amount_b, 'b_to_c')
-
-                # Step 3: C -> A
-                final_amount_a = amm_copy.swap(amount_c, 'c_to_a')
-
-                profit = final_amount_a - start_amount
-                profit_percentage = (profit / start_amount) * 100
-
-                if profit_percentage > self.min_profit_threshold:
-                    paths.append({
-                        'path': [token_a, token_b, token_c, token_a],
-                        'start_amount': start_amount,
-                        'end_amount': final_amount_a,
-                        'profit': profit,
-                        'profit_percentage': profit_percentage,
-                        'amm': amm.name
-                    })
+        for row, col in np.argwhere(profit_percentage > self.min_profit_threshold):
+            paths.append({
+                'path': [token_a, token_b, token_c, token_a],
+                'start_amount': _TRIANGULAR_START_AMOUNTS[col],
+                'end_amount': final_amount_a[row, col],
+                'profit': profit[row, col],
+                'profit_percentage': profit_percentage[row, col],
+                'pools': [pools.names[i] for i in legs[row]]
+            })
 
         return paths
@@ -1,35 +1,74 @@
 """Gas Cost Estimation for Transactions"""
 
+from collections import namedtuple
+from types import MappingProxyType
+
+# Typical gas usage per swap type
+_GAS_UNITS = MappingProxyType({
+    'uniswap_v2': 120000,
+    'uniswap_v3': 150000,
+    'curve': 200000,
+    'multi_hop': 200000
+})
+_DEFAULT_GAS_UNITS = 150000
+
+GasCost = namedtuple(
+    'GasCost', ['gas_units', 'gas_price_gwei', 'total_cost_eth', 'total_cost_usd']
+)
+
 class GasEstimator:
     """Estimates gas costs for different transaction types"""
 
     def __init__(self, web3_client=None):
         self.w3 = web3_client
-        self.gas_prices = {
+        self._set_gas_prices({
             'slow': 0,
             'standard': 0,
             'fast': 0
-        }
+        })
         if web3_client:
             self.update_gas_prices()
 
+    @property
+    def gas_prices(self):
+        """Gas prices in wei per speed, as a read-only mapping"""
+        return self._gas_prices
+
+    @gas_prices.setter
+    def gas_prices(self, gas_prices):
+        self._set_gas_prices(gas_prices)
+
+    def _set_gas_prices(self, gas_prices):
+        """
+        Store gas prices and precompute per-speed wei -> ETH factors.
+
+        The stored mapping is read-only, because the derived factors and
+        cached estimates would miss in-place edits; new prices must be
+        assigned whole or go through update_gas_prices.
+        """
+        self._gas_prices = MappingProxyType(dict(gas_prices))
+        self._cost_factor_eth = {
+            speed: price / 1e18 for speed, price in gas_prices.items()
+        }
+        self._swap_costs = {}
+
     def update_gas_prices(self):
         """Fetch current gas prices from network"""
         if not self.w3:
             # Mock gas prices
-            self.gas_prices = {
+            self._set_gas_prices({
                 'slow': 20e9,      # 20 gwei
                 'standard': 30e9,  # 30 gwei
                 'fast': 50e9       # 50 gwei
-            }
+            })
             return
 
         current_price = self.w3.eth.gas_price
-        self.gas_prices = {
+        self._set_gas_prices({
             'slow': current_price * 0.8,
             'standard': current_price,
             'fast': current_price * 1.2
-        }
+        })
 
     def estimate_swap_cost(self, swap_type='uniswap_v2', speed='standard'):
         """
@@ -39,29 +78,26 @@ class GasEstimator:
         - Uniswap V2 swap: 100,000 - 150,000 gas
         - Uniswap V3 swap: 120,000 - 180,000 gas
         - Multi-hop swap: 150,000 - 250,000 gas
-        """
-        gas_units = {
-            'uniswap_v2': 120000,
-            'uniswap_v3': 150000,
-            'curve': 200000,
-            'multi_hop': 200000
-        }
 
-        gas_price = self.gas_prices[speed]
-        estimated_gas = gas_units.get(swap_type, 150000)
-
-        # Cost in wei
-        cost_wei = gas_price * estimated_gas
+        Returns:
+            GasCost, cached per (swap_type, speed) until gas prices change
+        """
+        key = (swap_type, speed)
+        cost = self._swap_costs.get(key)
+        if cost is not None:
+            return cost
 
-        # Convert to ETH
-        cost_eth = cost_wei / 1e18
+        estimated_gas = _GAS_UNITS.get(swap_type, _DEFAULT_GAS_UNITS)
+        cost_eth = self._cost_factor_eth[speed] * estimated_gas
 
-        return {
-            'gas_units': estimated_gas,
-            'gas_price_gwei': gas_price / 1e9,
-            'total_cost_eth': cost_eth,
-            'total_cost_usd': cost_eth * 2000  # Assuming ETH = $2000
-        }
+        cost = GasCost(
+            gas_units=estimated_gas,
+            gas_price_gwei=self.gas_prices[speed] / 1e9,
+            total_cost_eth=cost_eth,
+            total_cost_usd=cost_eth * 2000  # Assuming ETH = $2000
+        )
+        self._swap_costs[key] = cost
+        return cost
 
     def estimate_arbitrage_cost(self, n_swaps=2, speed='fast'):
         """
@@ -76,9 +112,7 @@ class GasEstimator:
         swap_gas = 150000 * n_swaps
         total_gas = approval_gas + swap_gas
 
-        gas_price = self.gas_prices[speed]
-        cost_wei = gas_price * total_gas * 1.1  # 10% safety margin
-        cost_eth = cost_wei / 1e18
+        cost_eth = self._cost_factor_eth[speed] * total_gas * 1.1  # 10% safety margin
 
         return {
             'total_gas': total_gas,
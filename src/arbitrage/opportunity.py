@@ -0,0 +1,32 @@
+"""Arbitrage Opportunity Record"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Opportunity:
+    """
+    Two-pool arbitrage opportunity.
+
+    Fields can be read as attributes or by key (opp['expected_profit']),
+    the way the opportunity dicts used previously were read.
+    """
+
+    __slots__ = (
+        'buy_pool', 'sell_pool', 'token_in', 'token_out',
+        'amount', 'expected_profit', 'timestamp'
+    )
+
+    buy_pool: str
+    sell_pool: str
+    token_in: str
+    token_out: str
+    amount: float
+    expected_profit: float
+    timestamp: int
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
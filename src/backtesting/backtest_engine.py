@@ -1,7 +1,51 @@
 """Backtesting Engine for Arbitrage Strategies"""
 
 import numpy as np
-import pandas as pd
+
+from ..utils.jit import njit
+
+
+@njit(cache=True)
+def _portfolio_stats(values):
+    """
+    Return statistics of a portfolio value series in a single pass.
+
+    Matches the pandas pct_change / cumprod / cummax chain: the first
+    period has no return, and the running maximum starts at the first
+    cumulative return. The standard deviation uses ddof=1 (Welford).
+
+    Returns:
+        (mean_return, std_return, sharpe_ratio, max_drawdown)
+    """
+    n = len(values)
+    mean = 0.0
+    m2 = 0.0
+    cum = 1.0
+    running_max = 1.0
+    max_drawdown = np.nan
+
+    for i in range(1, n):
+        ret = (values[i] - values[i - 1]) / values[i - 1]
+
+        delta = ret - mean
+        mean += delta / i
+        m2 += delta * (ret - mean)
+
+        cum *= 1 + ret
+        if i == 1 or cum > running_max:
+            running_max = cum
+        drawdown = (cum - running_max) / running_max
+        if i == 1 or drawdown < max_drawdown:
+            max_drawdown = drawdown
+
+    n_returns = n - 1
+    if n_returns < 1:
+        mean = np.nan
+    std = np.sqrt(m2 / (n_returns - 1)) if n_returns > 1 else np.nan
+    sharpe_ratio = (mean / std) * np.sqrt(365) if std > 0 else 0.0
+
+    return mean, std, sharpe_ratio, max_drawdown
+
 
 class ArbitrageBacktester:
     """Backtests arbitrage strategies on historical data"""
@@ -14,6 +58,10 @@ class ArbitrageBacktester:
             'total_value': initial_capital
         }
         self.trades = []
+
+        # Columnar trade profits for metrics; grown geometrically when full
+        self._profits = np.empty(1024)
+        self._n_trades = 0
         self.performance_metrics = {}
 
     def run_backtest(self, historical_data, strategy):
@@ -27,14 +75,11 @@ class ArbitrageBacktester:
         Returns:
             Performance metrics and trade log
         """
-        portfolio_values = []
-
-        # Group by timestamp
-        for timestamp in historical_data['timestamp'].unique():
-            current_state = historical_data[
-                historical_data['timestamp'] == timestamp
-            ]
+        # Group by timestamp in a single hashed pass (first-seen order)
+        groups = historical_data.groupby('timestamp', sort=False)
+        portfolio_values = [None] * groups.ngroups
 
+        for step, (timestamp, current_state) in enumerate(groups):
             # Detect opportunities
             opportunities = strategy.find_two_pool_arbitrage(
                 ('ETH', 'USDC')
@@ -45,12 +90,11 @@ class ArbitrageBacktester:
                 best_opp = max(opportunities, key=lambda x: x['expected_profit'])
                 self._execute_trade(best_opp, timestamp)
 
-            # Track portfolio value
-            current_value = self._calculate_portfolio_value()
-            portfolio_values.append({
+            # Track portfolio value (cash only; no holdings are marked to market)
+            portfolio_values[step] = {
                 'timestamp': timestamp,
-                'value': current_value
-            })
+                'value': self.portfolio['cash']
+            }
 
         # Calculate metrics
         self._calculate_performance_metrics(portfolio_values)
@@ -73,37 +117,32 @@ class ArbitrageBacktester:
         }
 
         self.trades.append(trade)
-        self.portfolio['cash'] += opportunity['expected_profit']
 
-    def _calculate_portfolio_value(self):
-        """Calculate current portfolio value"""
-        return self.portfolio['cash']
+        if self._n_trades == len(self._profits):
+            self._profits = np.resize(self._profits, 2 * len(self._profits))
+        self._profits[self._n_trades] = opportunity['expected_profit']
+        self._n_trades += 1
+
+        self.portfolio['cash'] += opportunity['expected_profit']
 
     def _calculate_performance_metrics(self, portfolio_history):
         """Calculate key performance metrics"""
-        df = pd.DataFrame(portfolio_history)
-        df['returns'] = df['value'].pct_change()
+        values = np.array(
+            [point['value'] for point in portfolio_history], dtype=np.float64
+        )
 
         # Total return
-        total_return = (df['value'].iloc[-1] - self.initial_capital) / self.initial_capital
-
-        # Sharpe ratio
-        returns_mean = df['returns'].mean()
-        returns_std = df['returns'].std()
-        sharpe_ratio = (returns_mean / returns_std) * np.sqrt(365) if returns_std > 0 else 0
+        total_return = (values[-1] - self.initial_capital) / self.initial_capital
 
-        # Maximum drawdown
-        cumulative_returns = (1 + df['returns']).cumprod()
-        running_max = cumulative_returns.cummax()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
+        # Sharpe ratio and maximum drawdown in one pass over the values
+        _, _, sharpe_ratio, max_drawdown = _portfolio_stats(values)
 
         # Win rate
-        profitable_trades = sum(1 for t in self.trades if t['profit'] > 0)
-        win_rate = profitable_trades / len(self.trades) if self.trades else 0
+        profits = self._profits[:self._n_trades]
+        win_rate = float((profits > 0).sum()) / len(profits) if len(profits) else 0
 
         # Average profit
-        avg_profit = np.mean([t['profit'] for t in self.trades]) if self.trades else 0
+        avg_profit = profits.mean() if len(profits) else 0
 
         self.performance_metrics = {
             'total_return': total_return,
@@ -111,5 +150,5 @@ class ArbitrageBacktester:
             'max_drawdown': max_drawdown,
             'win_rate': win_rate,
             'avg_profit_per_trade': avg_profit,
-            'total_trades': len(self.trades)
+            'total_trades': self._n_trades
         }
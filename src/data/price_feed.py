@@ -1,29 +1,66 @@
 """Real-time Price Feed Management"""
 
+import asyncio
+import contextlib
 import time
+import aiohttp
 import requests
 
 class RealTimePriceFeed:
     """Manages real-time price feeds from multiple DEXs"""
 
-    def __init__(self, protocols):
+    def __init__(self, protocols, interval=1, queue_size=16):
+        """
+        Args:
+            protocols: Protocol names to fetch prices from
+            interval: Update interval in seconds for async iteration
+            queue_size: Maximum buffered updates for async iteration
+        """
         self.protocols = protocols
         self.prices = {}
+        self.interval = interval
+        self.queue_size = queue_size
 
-    def fetch_current_prices(self):
-        """Fetch current prices from all protocols"""
-        prices = {}
+    async def _fetch_one(self, session, protocol):
+        """Fetch the current price snapshot for a single protocol"""
+        # Placeholder - implement the protocol's GraphQL/REST call on session
+        return {
+            'ETH/USDC': 2000.0,
+            'timestamp': time.time()
+        }
+
+    async def fetch_current_prices_async(self, session=None):
+        """
+        Fetch current prices from all protocols concurrently.
+
+        Args:
+            session: Optional aiohttp.ClientSession to reuse; a new one is
+                opened (and closed) for this call when omitted
+
+        Returns:
+            Price dictionary keyed by protocol
+        """
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self.fetch_current_prices_async(session)
 
-        for protocol in self.protocols:
-            # Placeholder - implement actual API calls
-            prices[protocol] = {
-                'ETH/USDC': 2000.0,
-                'timestamp': time.time()
-            }
+        results = await asyncio.gather(
+            *[self._fetch_one(session, protocol) for protocol in self.protocols]
+        )
 
+        prices = dict(zip(self.protocols, results))
         self.prices = prices
         return prices
 
+    def fetch_current_prices(self):
+        """
+        Fetch current prices from all protocols.
+
+        Blocking wrapper around fetch_current_prices_async; call the async
+        version directly from code already running in an event loop.
+        """
+        return asyncio.run(self.fetch_current_prices_async())
+
     def stream(self, interval=1):
         """
         Stream price updates at specified interval.
@@ -38,3 +75,57 @@ class RealTimePriceFeed:
             update = self.fetch_current_prices()
             yield update
             time.sleep(interval)
+
+    async def stream_async(self, interval, queue):
+        """
+        Publish price updates to a queue at specified interval.
+
+        Runs until cancelled, sharing one ClientSession across fetches. When
+        the queue is full the oldest update is dropped, so a slow consumer
+        never stalls the producer.
+
+        Args:
+            interval: Update interval in seconds
+            queue: Bounded asyncio.Queue receiving price update dictionaries
+        """
+        async with aiohttp.ClientSession() as session:
+            while True:
+                update = await self.fetch_current_prices_async(session)
+                try:
+                    queue.put_nowait(update)
+                except asyncio.QueueFull:
+                    # Drop the oldest update, marking it done for join()
+                    queue.get_nowait()
+                    queue.task_done()
+                    queue.put_nowait(update)
+                await asyncio.sleep(interval)
+
+    async def __aiter__(self):
+        """
+        Iterate price updates with `async for update in feed`.
+
+        Starts a stream_async producer on a bounded queue; the producer is
+        cancelled when iteration stops, and its errors are re-raised here.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.ensure_future(self.stream_async(self.interval, queue))
+        getter = None
+
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait(
+                    {getter, producer}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    getter.cancel()
+                    producer.result()
+                yield getter.result()
+        finally:
+            if getter is not None and not getter.done():
+                getter.cancel()
+
+            # Wait for the producer so its ClientSession closes here
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
@@ -0,0 +1,22 @@
+"""Optional Numba JIT Compilation"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit.
+
+        Supports both bare (@njit) and configured (@njit(cache=True)) usage
+        so kernels fall back to plain Python when numba is not installed.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -2,6 +2,8 @@
 
 import pytest
 from src.amm.uniswap_v2 import UniswapV2AMM
+from src.amm.curve import CurveAMM
+from src.amm.pool_set import PoolSet, KIND_CURVE
 
 def test_uniswap_v2_get_amount_out():
     """Test Uniswap V2 pricing formula"""
@@ -40,3 +42,67 @@ def test_swap_updates_reserves():
     # K should remain approximately constant (within fee tolerance)
     new_k = amm.reserve0 * amm.reserve1
     assert abs(new_k - initial_k) / initial_k < 0.01
+
+def test_curve_balanced_pool():
+    """Test StableSwap invariant and near 1:1 pricing for a balanced pool"""
+    amm = CurveAMM([1000000, 1000000], amplification_coef=100, fee=0.0004)
+
+    # For a balanced pool D equals the sum of reserves
+    assert abs(amm.get_D() - 2000000) < 1
+
+    amount_out = amm.get_amount_out(1000)
+    assert abs(amount_out - 1000 * (1 - 0.0004)) < 0.1
+
+def test_curve_swap_invalidates_invariant_cache():
+    """Test that D is recomputed from the new reserves after a swap"""
+    amm = CurveAMM([1000000, 1000000])
+    D_before = amm.get_D()
+
+    amm.swap(10000, 'x_to_y')
+
+    assert amm.get_D() == CurveAMM(amm.reserves).get_D()
+    assert amm.get_D() != D_before
+
+def test_pool_set_update_in_place():
+    """Test PoolSet spot prices and in-place reserve updates"""
+    pools = PoolSet.from_amms([
+        UniswapV2AMM(100000, 200000, name="Pool A"),
+        CurveAMM([1000000, 1010000], name="Curve"),
+    ])
+
+    assert pools.kind[1] == KIND_CURVE
+    assert pools.spot_prices()[0] == 2.0
+
+    pools.update(0, 100000, 210000)
+    assert pools.spot_prices()[0] == 2.1
+
+    amm = UniswapV2AMM.from_poolset(pools, 0)
+    assert amm.name == "Pool A"
+    assert amm.get_spot_price() == 2.1
+
+def test_curve_reserve_assignment_refreshes_state():
+    """Test that assigning reserves keeps quotes and D consistent"""
+    amm = CurveAMM([1000000, 1000000])
+    amm.get_D()
+
+    amm.reserves = [1000000, 1100000]
+    fresh = CurveAMM([1000000, 1100000])
+
+    assert amm.reserves == (1000000.0, 1100000.0)
+    assert amm.get_D() == fresh.get_D()
+    assert amm.get_amount_out(1000) == fresh.get_amount_out(1000)
+
+    # Item writes would bypass the cache, so the tuple view rejects them
+    with pytest.raises(TypeError):
+        amm.reserves[0] = 0
+
+def test_curve_reserve_assignment_changes_coin_count():
+    """Test that assigning a different number of coins refreshes n and Ann"""
+    amm = CurveAMM([1000000, 1000000])
+    amm.reserves = [1000000] * 3
+    fresh = CurveAMM([1000000] * 3)
+
+    assert amm.n == 3
+    assert amm._Ann == fresh._Ann
+    assert amm.get_D() == fresh.get_D()
+    assert amm.get_amount_out(1000) == fresh.get_amount_out(1000)
@@ -1,8 +1,13 @@
 """Test Arbitrage Detection"""
 
+import numpy as np
 import pytest
 from src.amm.uniswap_v2 import UniswapV2AMM
+from src.amm.curve import CurveAMM
+from src.amm.pool_set import PoolSet, KIND_UNISWAP_V2, KIND_CURVE
 from src.arbitrage.detector import ArbitrageDetector
+from src.arbitrage.gas_estimator import GasEstimator
+from src.arbitrage.opportunity import Opportunity
 
 def test_detect_arbitrage_opportunity():
     """Test arbitrage detection between two pools"""
@@ -27,3 +32,145 @@ def test_no_arbitrage_same_price():
     opportunities = detector.find_two_pool_arbitrage(('ETH', 'USDC'))
 
     assert len(opportunities) == 0
+
+def test_optimal_trade_size_interior():
+    """Test that the optimizer finds the interior profit maximum"""
+    buy_pool = UniswapV2AMM(100000, 200000)
+    sell_pool = UniswapV2AMM(100000, 197000)
+
+    detector = ArbitrageDetector([buy_pool, sell_pool])
+    amount = detector._optimize_trade_size(buy_pool, sell_pool, 'ETH', 'USDC')
+
+    # Brent's method on the same profit curve converges to ~227.44
+    assert abs(amount - 227.44) < 0.01
+
+def test_detector_accepts_pool_set(monkeypatch):
+    """Test that a PoolSet-backed detector scans updated reserves"""
+    sized = []
+
+    def fake_optimize(r0a, r1a, fa, r0b, r1b, fb):
+        sized.append((r1a.tolist(), r1b.tolist()))
+        return np.ones(len(r0a)), np.ones(len(r0a))
+
+    monkeypatch.setattr('src.arbitrage.detector._optimize_v2_v2', fake_optimize)
+    pools = PoolSet(
+        r0=[100000, 100000], r1=[200000, 200000], fee=[0.003, 0.003],
+        names=['A', 'B']
+    )
+    detector = ArbitrageDetector(pools)
+
+    assert detector.find_two_pool_arbitrage(('ETH', 'USDC')) == []
+
+    # The in-place update moves B's price past the 0.001 filter
+    pools.update(1, 100000, 210000)
+    opportunities = detector.find_two_pool_arbitrage(('ETH', 'USDC'))
+
+    assert sized[-1] == ([200000.0], [210000.0])
+    assert [(o.buy_pool, o.sell_pool) for o in opportunities] == [('A', 'B')]
+
+def test_gas_cost_filters_and_refreshes():
+    """Test that scans filter on the cached gas cost and re-estimate it"""
+    class StubGasEstimator:
+        def __init__(self):
+            self.cost_eth = 0.0
+            self.calls = 0
+
+        def estimate_arbitrage_cost(self):
+            self.calls += 1
+            return {'cost_eth': self.cost_eth}
+
+    # Curve's amplified curve prices near 1:1 despite its 1.2 reserve ratio
+    pools = [
+        UniswapV2AMM(1000000, 1100000, name="V2"),
+        CurveAMM([1000000, 1200000], name="Curve"),
+    ]
+    gas_estimator = StubGasEstimator()
+    detector = ArbitrageDetector(
+        pools, min_profit_threshold=10,
+        gas_estimator=gas_estimator, gas_refresh_interval=3
+    )
+    assert gas_estimator.calls == 1
+
+    gross_profit = detector.find_two_pool_arbitrage(('A', 'B'))[0]['expected_profit']
+    assert gross_profit > 10
+
+    # Cached cost is used until the refresh interval elapses
+    gas_estimator.cost_eth = gross_profit - 5
+    assert len(detector.find_two_pool_arbitrage(('A', 'B'))) == 1
+    assert gas_estimator.calls == 1
+
+    opportunities = detector.find_two_pool_arbitrage(('A', 'B'))
+    assert gas_estimator.calls == 2
+    assert opportunities == []
+
+    gas_estimator.cost_eth = 1.0
+    for _ in range(3):
+        opportunities = detector.find_two_pool_arbitrage(('A', 'B'))
+    assert gas_estimator.calls == 3
+    assert opportunities[0]['expected_profit'] == pytest.approx(gross_profit - 1.0)
+
+def test_opportunity_supports_key_access():
+    """Test that Opportunity fields read like the previous dict payload"""
+    opp = Opportunity('Pool A', 'Pool B', 'ETH', 'USDC', 10.0, 0.5, 0)
+
+    assert opp['expected_profit'] == opp.expected_profit == 0.5
+    with pytest.raises(KeyError):
+        opp['profit']
+
+def test_triangular_arbitrage_across_pools():
+    """Test a profitable A -> B -> C -> A cycle through three pools"""
+    pool_ab = UniswapV2AMM(1000000, 1000000, name="A/B")
+    pool_bc = UniswapV2AMM(1000000, 1000000, name="B/C")
+    pool_ca = UniswapV2AMM(1000000, 1050000, name="C/A")
+
+    detector = ArbitrageDetector([pool_ab, pool_bc, pool_ca], min_profit_threshold=1)
+    paths = detector.find_triangular_arbitrage(('A', 'B', 'C'), [(0, 1, 2)])
+
+    assert len(paths) > 0
+    assert paths[0]['pools'] == ["A/B", "B/C", "C/A"]
+    assert paths[0]['profit'] > 0
+
+def test_mixed_curve_v2_pools():
+    """Test that Curve/V2 pairs go through the numeric fallback"""
+    v2_pool = UniswapV2AMM(1000000, 1050000, name="V2")
+    curve_pool = CurveAMM([1000000, 1000000], name="Curve")
+
+    detector = ArbitrageDetector([v2_pool, curve_pool], min_profit_threshold=0)
+    assert isinstance(detector.find_two_pool_arbitrage(('A', 'B')), list)
+
+    # token0 -> token1 in V2, then back through the ~1:1 Curve pool
+    amount = detector._optimize_trade_size(v2_pool, curve_pool, 'A', 'B')
+    assert amount > 0
+
+    direct = curve_pool.get_amount_out(
+        v2_pool.get_amount_out(amount, v2_pool.reserve0, v2_pool.reserve1), 1, 0
+    )
+    assert direct - amount > 0
+
+def test_pool_set_detector_skips_curve_rows():
+    """Test that PoolSet-mode scans skip rows without a V2 closed form"""
+    pools = PoolSet(
+        r0=[1000000, 1000000], r1=[1000000, 1050000],
+        fee=[0.003, 0.0004], kind=[KIND_UNISWAP_V2, KIND_CURVE]
+    )
+    detector = ArbitrageDetector(pools, min_profit_threshold=-1e9)
+
+    assert detector.find_two_pool_arbitrage(('A', 'B')) == []
+
+def test_gas_price_update_clears_cached_estimates():
+    """Test that new gas prices invalidate cached swap cost estimates"""
+    gas_estimator = GasEstimator()
+    assert gas_estimator.estimate_swap_cost().total_cost_eth == 0
+
+    gas_estimator.update_gas_prices()
+    cost = gas_estimator.estimate_swap_cost()
+    assert cost.total_cost_eth == pytest.approx(30e9 * 120000 / 1e18)
+
+    # Item writes are rejected, whole assignment refreshes the estimates
+    with pytest.raises(TypeError):
+        gas_estimator.gas_prices['standard'] = 100e9
+
+    gas_estimator.gas_prices = {'slow': 200e9, 'standard': 300e9, 'fast': 400e9}
+    cost = gas_estimator.estimate_swap_cost()
+    assert cost.total_cost_eth == pytest.approx(0.036)
+    assert cost.gas_price_gwei == pytest.approx(300)
@@ -0,0 +1,117 @@
+"""Test Backtesting Engine"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.backtest_engine import ArbitrageBacktester, _portfolio_stats
+
+def _pandas_stats(values):
+    """Reference statistics using the original pandas formulas"""
+    returns = pd.Series(values).pct_change()
+    returns_mean = returns.mean()
+    returns_std = returns.std()
+    sharpe_ratio = (returns_mean / returns_std) * np.sqrt(365) if returns_std > 0 else 0
+
+    cumulative_returns = (1 + returns).cumprod()
+    running_max = cumulative_returns.cummax()
+    max_drawdown = ((cumulative_returns - running_max) / running_max).min()
+
+    return returns_mean, returns_std, sharpe_ratio, max_drawdown
+
+class _ScriptedStrategy:
+    """Stub detector returning one scripted opportunity per scan"""
+
+    def __init__(self, profits):
+        self.profits = iter(profits)
+
+    def find_two_pool_arbitrage(self, token_pair):
+        profit = next(self.profits)
+        if profit is None:
+            return []
+        return [{
+            'buy_pool': 'A',
+            'sell_pool': 'B',
+            'amount': 1.0,
+            'expected_profit': profit
+        }]
+
+@pytest.mark.parametrize("n", [1, 2, 3, 50])
+def test_portfolio_stats_matches_pandas(n):
+    """Test the single-pass kernel against pct_change/cumprod/cummax/std"""
+    rng = np.random.default_rng(n)
+    values = 10000 * np.cumprod(1 + rng.normal(0, 0.01, n))
+
+    expected = _pandas_stats(values)
+    result = _portfolio_stats(values)
+
+    for got, want in zip(result, expected):
+        if np.isnan(want):
+            assert np.isnan(got)
+        else:
+            assert got == pytest.approx(want, rel=1e-9, abs=1e-15)
+
+def test_portfolio_stats_short_series():
+    """Test NaN handling and zero Sharpe ratio for n <= 2"""
+    mean, std, sharpe, max_dd = _portfolio_stats(np.array([10000.0]))
+    assert np.isnan(mean) and np.isnan(std) and np.isnan(max_dd)
+    assert sharpe == 0
+
+    mean, std, sharpe, max_dd = _portfolio_stats(np.array([10000.0, 10100.0]))
+    assert mean == pytest.approx(0.01)
+    assert np.isnan(std)
+    assert sharpe == 0
+    assert max_dd == 0
+
+def test_portfolio_stats_flat_series():
+    """Test that zero return volatility gives a zero Sharpe ratio"""
+    _, std, sharpe, max_dd = _portfolio_stats(np.full(5, 10000.0))
+    assert std == 0
+    assert sharpe == 0
+    assert max_dd == 0
+
+def test_run_backtest_groups_timestamps_in_first_seen_order():
+    """Test one scan per timestamp, in first-seen order, with cash metrics"""
+    data = pd.DataFrame({
+        'timestamp': [30, 10, 30, 20, 10],
+        'pool': ['A', 'A', 'B', 'A', 'B']
+    })
+    backtester = ArbitrageBacktester(initial_capital=10000)
+
+    result = backtester.run_backtest(data, _ScriptedStrategy([100, None, -50]))
+
+    history = result['portfolio_history']
+    assert [point['timestamp'] for point in history] == [30, 10, 20]
+    assert [point['value'] for point in history] == [10100, 10100, 10050]
+    assert [trade['timestamp'] for trade in result['trades']] == [30, 20]
+
+    metrics = result['metrics']
+    expected = _pandas_stats(np.array([10100.0, 10100.0, 10050.0]))
+    assert metrics['total_return'] == pytest.approx(0.005)
+    assert metrics['sharpe_ratio'] == pytest.approx(expected[2])
+    assert metrics['max_drawdown'] == pytest.approx(expected[3])
+    assert metrics['win_rate'] == 0.5
+    assert metrics['avg_profit_per_trade'] == 25
+    assert metrics['total_trades'] == 2
+
+def test_run_backtest_grows_profit_buffer():
+    """Test trade metrics past the initial 1024-slot profit buffer"""
+    n = 2500
+    rng = np.random.default_rng(0)
+    profits = rng.normal(0, 10, n).tolist()
+    data = pd.DataFrame({'timestamp': np.arange(n)})
+    backtester = ArbitrageBacktester(initial_capital=1e6)
+
+    result = backtester.run_backtest(data, _ScriptedStrategy(profits))
+
+    trade_profits = [trade['profit'] for trade in backtester.trades]
+    assert len(backtester._profits) > 1024
+    assert np.array_equal(backtester._profits[:n], trade_profits)
+
+    metrics = result['metrics']
+    assert metrics['total_trades'] == len(trade_profits) == n
+    assert metrics['win_rate'] == pytest.approx(
+        sum(p > 0 for p in trade_profits) / n
+    )
+    assert metrics['avg_profit_per_trade'] == pytest.approx(
+        sum(trade_profits) / n
+    )
@@ -0,0 +1,137 @@
+"""Test Real-time Price Feed"""
+
+import asyncio
+from src.data.price_feed import RealTimePriceFeed
+
+def _counting_feed(**kwargs):
+    """Feed whose fetches return an increasing tick number"""
+    feed = RealTimePriceFeed(['uniswap_v2'], **kwargs)
+    ticks = []
+
+    async def fetch(session=None):
+        ticks.append(len(ticks))
+        return {'tick': ticks[-1]}
+
+    feed.fetch_current_prices_async = fetch
+    return feed, ticks
+
+def test_fetch_current_prices_keeps_protocol_order():
+    """Test that concurrent fetches are keyed in protocol order"""
+    feed = RealTimePriceFeed(['uniswap_v2', 'curve'])
+    delays = {'uniswap_v2': 0.02, 'curve': 0}
+    finished = []
+
+    async def fetch_one(session, protocol):
+        # The first protocol completes last
+        await asyncio.sleep(delays[protocol])
+        finished.append(protocol)
+        return {'ETH/USDC': 2000.0, 'protocol': protocol}
+
+    feed._fetch_one = fetch_one
+    prices = feed.fetch_current_prices()
+
+    assert finished == ['curve', 'uniswap_v2']
+    assert list(prices) == ['uniswap_v2', 'curve']
+    assert [p['protocol'] for p in prices.values()] == ['uniswap_v2', 'curve']
+    assert feed.prices == prices
+
+def test_stream_drops_oldest_when_queue_full():
+    """Test that a slow consumer only sees the newest updates"""
+    feed, ticks = _counting_feed()
+
+    async def run():
+        queue = asyncio.Queue(maxsize=2)
+        producer = asyncio.ensure_future(feed.stream_async(0, queue))
+        while len(ticks) < 5:
+            await asyncio.sleep(0)
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        buffered = []
+        while not queue.empty():
+            buffered.append(queue.get_nowait()['tick'])
+            queue.task_done()
+
+        # Dropped updates are marked done too, so join() doesn't hang
+        await asyncio.wait_for(queue.join(), timeout=1)
+        return buffered
+
+    buffered = asyncio.run(run())
+
+    assert buffered == [len(ticks) - 2, len(ticks) - 1]
+
+def test_async_iteration_break_stops_producer():
+    """Test that leaving async for cancels the producer"""
+    feed, ticks = _counting_feed(interval=0, queue_size=2)
+
+    async def run():
+        async for update in feed:
+            if update['tick'] == 2:
+                break
+        # The event loop closes the abandoned iterator on its next passes
+        for _ in range(10):
+            await asyncio.sleep(0)
+        settled = len(ticks)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        return settled, len(ticks), pending
+
+    settled, produced_later, pending = asyncio.run(run())
+
+    assert produced_later == settled
+    assert not pending
+
+def test_closing_iteration_closes_session(monkeypatch):
+    """Test that the producer's session is closed once iteration ends"""
+    sessions = []
+
+    class FakeSession:
+        closed = False
+
+        async def __aenter__(self):
+            sessions.append(self)
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+    monkeypatch.setattr('src.data.price_feed.aiohttp.ClientSession', FakeSession)
+    feed, _ = _counting_feed(interval=0)
+
+    async def run():
+        updates = feed.__aiter__()
+        await updates.__anext__()
+        await updates.aclose()
+        return [session.closed for session in sessions]
+
+    assert asyncio.run(run()) == [True]
+
+def test_cancelled_consumer_leaves_no_tasks():
+    """Test that cancelling an async for consumer cleans up its tasks"""
+    feed, ticks = _counting_feed(interval=60)
+
+    async def consume():
+        async for _ in feed:
+            pass
+
+    async def run():
+        consumer = asyncio.ensure_future(consume())
+        # Let the consumer take the first tick and block on the next
+        while len(ticks) < 1:
+            await asyncio.sleep(0)
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(run()) == set()